@@ -1,7 +1,6 @@
 """Platform for the Girea System 3000 cover integration."""
 from __future__ import annotations
 
-import logging
 from typing import Any
 
 from homeassistant.components.cover import (
@@ -77,37 +76,40 @@ class GireaSystem3000Cover(
         # A passive bluetooth device is always available as long as it's running
         return True
 
-    async def async_open_cover(self, **kwargs: Any) -> None:
-        """Open the cover."""
+    @callback
+    def _mark_unavailable(self) -> None:
+        """Flag the entity unavailable after a failed command."""
+        # Skip the state write if an earlier failure already flagged it
+        if not self._attr_available:
+            return
+        self._attr_available = False
+        self.async_write_ha_state()
+
+    async def _async_send(self, action: str) -> None:
+        """Send a fixed shutter action to the device."""
         try:
-            await self._client.send_up_command()
+            await self._client.send(action)
         except UpdateFailed:
-            self._attr_available = False
-            self.async_write_ha_state()
+            self._mark_unavailable()
+
+    async def async_open_cover(self, **kwargs: Any) -> None:
+        """Open the cover."""
+        await self._async_send("up")
 
     async def async_close_cover(self, **kwargs: Any) -> None:
         """Close the cover."""
-        try:
-            await self._client.send_down_command()
-        except UpdateFailed:
-            self._attr_available = False
-            self.async_write_ha_state()
+        await self._async_send("down")
 
     async def async_stop_cover(self, **kwargs: Any) -> None:
         """Stop the cover."""
-        try:
-            await self._client.send_stop_command()
-        except UpdateFailed:
-            self._attr_available = False
-            self.async_write_ha_state()
+        await self._async_send("stop")
 
     async def async_set_cover_position(self, **kwargs: Any) -> None:
         """Set cover position."""
         try:
             await self._client.set_absolute_position(kwargs['position'])
         except UpdateFailed:
-            self._attr_available = False
-            self.async_write_ha_state()
+            self._mark_unavailable()
 
     @property
     def current_cover_position(self) -> int | None:
@@ -1,16 +1,21 @@
 """Bluetooth LE communication for Gira System 3000 devices."""
 import asyncio
 import logging
-from typing import Any, cast, Optional
+import struct
+from typing import Any, cast
 
 from bleak import BleakClient, BleakError, BLEDevice
 from bleak_retry_connector import establish_connection
 
-from homeassistant.components.bluetooth import BluetoothServiceInfoBleak
+from homeassistant.components.bluetooth import (
+    BluetoothChange,
+    BluetoothScanningMode,
+    BluetoothServiceInfoBleak,
+    async_ble_device_from_address,
+)
 from homeassistant.components.bluetooth.passive_update_coordinator import (
     PassiveBluetoothDataUpdateCoordinator,
 )
-from homeassistant.components import bluetooth
 from homeassistant.core import HomeAssistant
 from homeassistant.helpers.update_coordinator import UpdateFailed
 
@@ -19,12 +24,17 @@ from .const import DOMAIN, LOGGER
 # Define the correct GATT Characteristic UUID.
 GIRA_COMMAND_CHARACTERISTIC_UUID = "97696341-f77a-43ae-8c35-09f0c5245308"
 
+# Seconds to keep an idle connection open after the last command
+DISCONNECT_DELAY = 30.0
+# Seconds to wait for newer position commands before sending the latest one
+COALESCE_DELAY = 0.15
+
 # --- Constants for Gira Command Generation ---
 # Basic command structure prefix
-COMMAND_PREFIX = bytearray.fromhex("F6032001")
+COMMAND_PREFIX = bytes.fromhex("F6032001")
 
 # Suffix constant often preceding the actual value
-COMMAND_SUFFIX = bytearray.fromhex("1001")
+COMMAND_SUFFIX = bytes.fromhex("1001")
 
 # Property IDs for different command types
 PROPERTY_ID_MOVE = 0xFF # For Up/Down commands
@@ -37,11 +47,23 @@ VALUE_UP = 0x00
 VALUE_DOWN = 0x01
 VALUE_STOP = 0x00 # Stop command uses 0x00 as its value
 
+# Layout of a command: prefix, property id, suffix, value
+_COMMAND_STRUCT = struct.Struct(f"!{len(COMMAND_PREFIX)}sB{len(COMMAND_SUFFIX)}sB")
+
 
 # --- Constants for Gira Broadcast Parsing ---
 GIRA_MANUFACTURER_ID = 1412
 # The correct, full prefix for a position broadcast
-BROADCAST_PREFIX = bytearray.fromhex("F7032001F61001")
+BROADCAST_PREFIX = bytes.fromhex("F7032001F61001")
+# A plain position broadcast is the prefix followed by a single position byte.
+# Read little-endian as a 64-bit int, the prefix occupies the low 56 bits.
+_BROADCAST_FRAME_LENGTH = len(BROADCAST_PREFIX) + 1
+_PREFIX_MASK = 0x00FFFFFFFFFFFFFF
+_EXPECTED_PREFIX_U64 = int.from_bytes(BROADCAST_PREFIX, "little")
+# Device position byte (0 = open, 255 = closed) -> HA percentage (100 = open)
+_POSITION_LUT: tuple[int, ...] = tuple(
+    round(100 * (255 - position_byte) / 255) for position_byte in range(256)
+)
 
 
 class GiraPassiveBluetoothDataUpdateCoordinator(PassiveBluetoothDataUpdateCoordinator):
@@ -53,10 +75,18 @@ class GiraPassiveBluetoothDataUpdateCoordinator(PassiveBluetoothDataUpdateCoordi
             hass,
             LOGGER,
             address=address,
-            mode=bluetooth.BluetoothScanningMode.PASSIVE,
+            mode=BluetoothScanningMode.PASSIVE,
             connectable=False,
         )
         self._device_name = name  # Store name separately since 'name' property is read-only
+        # Latest parsed state, pushed to listeners straight from the scanner callback
+        self.data: dict[str, int] | None = None
+        # Devices repeat the same advertisement many times per second, cache the
+        # last frame and position so repeats don't wake the listeners.
+        self._last_raw: bytes | None = None
+        self._last_position: int | None = None
+        # Proxies can deliver the same advertisement more than once
+        self._last_advert_time: float = 0.0
         LOGGER.debug("Created coordinator instance for %s (%s)", name, address)
 
     def _async_handle_unavailable(
@@ -65,70 +95,115 @@ class GiraPassiveBluetoothDataUpdateCoordinator(PassiveBluetoothDataUpdateCoordi
         """Handle the device going unavailable."""
         LOGGER.debug("Handle unavailable for %s (%s)", self._device_name, self.address)
         self.last_update_success = False
+        self._last_raw = None
+        self._last_position = None
         self.async_update_listeners()
 
     def _async_handle_bluetooth_event(
         self,
         service_info: BluetoothServiceInfoBleak,
-        change: bluetooth.BluetoothChange,
-    ) -> Optional[dict]:
-        # Check if this event is for our device
-        if service_info.device.address.upper() != self.address.upper():
+        change: BluetoothChange,
+    ) -> None:
+        """Parse a passive advertisement and push the position to listeners."""
+        # The base coordinator registers its callback with an address matcher,
+        # so only advertisements from our device reach this point.
+        if service_info.time <= self._last_advert_time:
             return None
+        self._last_advert_time = service_info.time
 
-        manufacturer_data = service_info.manufacturer_data.get(GIRA_MANUFACTURER_ID)
-        if not manufacturer_data:
+        manufacturer_data = service_info.manufacturer_data
+        if GIRA_MANUFACTURER_ID not in manufacturer_data:
             return None
 
-        # Check if the BROADCAST_PREFIX is anywhere within the manufacturer_data
-        try:
-            # Find the starting index of the broadcast prefix
-            prefix_index = manufacturer_data.find(BROADCAST_PREFIX)
-        except (ValueError, AttributeError) as e:
+        raw = manufacturer_data[GIRA_MANUFACTURER_ID]
+        if raw == self._last_raw:
             return None
 
-        # Ensure we have enough bytes after the prefix to read the position
+        ha_position = parse_gira_broadcast(raw)
+        if ha_position is None:
+            return None
+
+        self._last_raw = raw
+        if ha_position == self._last_position:
+            return None
+        self._last_position = ha_position
+
+        # Passive coordinators have no refresh cycle, listeners read self.data
+        # directly when notified.
+        self.data = {"position": ha_position}
+        self.async_update_listeners()
+
+
+def parse_gira_broadcast(manufacturer_data: bytes) -> int | None:
+    """Extract the HA position (0-100) from Gira manufacturer data, if present."""
+
+    if len(manufacturer_data) == _BROADCAST_FRAME_LENGTH:
+        # Common case: the frame is exactly prefix + position byte, so the
+        # prefix check collapses into a single integer compare.
+        raw = int.from_bytes(manufacturer_data, "little")
+        if raw & _PREFIX_MASK != _EXPECTED_PREFIX_U64:
+            return None
+        position_byte = raw >> 56
+    else:
+        # Check if the BROADCAST_PREFIX is anywhere within the manufacturer_data
+        prefix_index = manufacturer_data.find(BROADCAST_PREFIX)
         if prefix_index == -1:
             return None
-            
+
+        # Ensure we have enough bytes after the prefix to read the position
         if len(manufacturer_data) < prefix_index + len(BROADCAST_PREFIX) + 1:
             LOGGER.debug("Not enough data after broadcast prefix")
             return None
 
         # Extract the position byte, which is 1 byte after the prefix
         position_byte = manufacturer_data[prefix_index + len(BROADCAST_PREFIX)]
-        ha_position = round(100 * (255 - position_byte) / 255)
 
-        LOGGER.info(
-            "Gira broadcast received from %s. Raw data: %s, Position byte: %s, HA Position: %s%%",
-            self._device_name,
+    ha_position = _POSITION_LUT[position_byte]
+
+    # Called for every advertisement, avoid building the hex dump unless needed
+    if LOGGER.isEnabledFor(logging.DEBUG):
+        LOGGER.debug(
+            "Gira broadcast received. Raw data: %s, Position byte: %s, HA Position: %s%%",
             manufacturer_data.hex(),
             position_byte,
             ha_position,
         )
-        
-        # This is the correct way to update the data for a passive coordinator
-        # by returning a dictionary containing the new data.
-        self.data = {"position": ha_position}
-        self.async_update_listeners()
-
+    return ha_position
 
 
-def _generate_command(property_id: int, value: int) -> bytearray:
+def _generate_command(property_id: int, value: int) -> bytes:
     """Generates the full command byte array from its parts."""
-    return (
-        COMMAND_PREFIX
-        + property_id.to_bytes(1, 'big')
-        + COMMAND_SUFFIX
-        + value.to_bytes(1, 'big')
-    )
-
-def generate_position_command(percentage: int) -> bytearray:
+    return _COMMAND_STRUCT.pack(COMMAND_PREFIX, property_id, COMMAND_SUFFIX, value)
+
+
+# --- Precomputed commands ---
+# All fixed commands are built once at import time instead of on every send.
+CMD_UP = _generate_command(PROPERTY_ID_MOVE, VALUE_UP)
+CMD_DOWN = _generate_command(PROPERTY_ID_MOVE, VALUE_DOWN)
+CMD_STOP = _generate_command(PROPERTY_ID_STOP, VALUE_STOP)
+CMD_STEP_UP = _generate_command(PROPERTY_ID_STEP, VALUE_UP)
+CMD_STEP_DOWN = _generate_command(PROPERTY_ID_STEP, VALUE_DOWN)
+
+_ACTIONS: dict[str, bytes] = {
+    "up": CMD_UP,
+    "down": CMD_DOWN,
+    "stop": CMD_STOP,
+    "step_up": CMD_STEP_UP,
+    "step_down": CMD_STEP_DOWN,
+}
+
+# Absolute position commands, indexed by HA percentage (0-100)
+POSITION_COMMANDS: tuple[bytes, ...] = tuple(
+    _generate_command(PROPERTY_ID_SET_POSITION, (100 - percentage) * 255 // 100)
+    for percentage in range(101)
+)
+
+
+def generate_position_command(percentage: int) -> bytes:
     """Generates the command for setting absolute blinds position."""
     if not 0 <= percentage <= 100:
         raise ValueError("Percentage must be between 0 and 100.")
-    per_to_byte = (100 - percentage) * 255 // 100
-    return _generate_command(PROPERTY_ID_SET_POSITION, per_to_byte)
+    return POSITION_COMMANDS[percentage]
 
 
 class GiraBLEClient:
@@ -141,30 +216,108 @@ class GiraBLEClient:
         self.name = name
         self._client: BleakClient | None = None
         self._is_connecting = asyncio.Lock()
+        self._disconnect_timer: asyncio.TimerHandle | None = None
+        self._writes_in_flight = 0
+        self._pending_command: bytes | None = None
+        self._pending_result: asyncio.Future[None] | None = None
+        self._flush_timer: asyncio.TimerHandle | None = None
 
-    async def send_command(self, command: bytearray) -> None:
+    async def send_command(self, command: bytes, coalesce: bool = False) -> None:
         """
-        Connect to the device, send a command, and then disconnect.
-        This is a single-shot, connect-on-demand method.
+        Send a command to the device.
+        With coalesce=True the command is held for COALESCE_DELAY seconds and
+        replaced by any newer coalesced command, so only the last one of a
+        burst (e.g. dragging the position slider) is written. Discrete
+        commands are sent immediately and drop any pending coalesced command;
+        callers waiting on a dropped command return without it being sent,
+        the discrete command having taken its place.
         """
+        if not coalesce:
+            self._drop_pending_command()
+            await self._async_write_command(command)
+            return
+
+        self._pending_command = command
+        if self._pending_result is None:
+            self._pending_result = self.hass.loop.create_future()
+        if self._flush_timer is not None:
+            self._flush_timer.cancel()
+        self._flush_timer = self.hass.loop.call_later(COALESCE_DELAY, self._flush)
+        # Shield so a cancelled caller doesn't cancel the write for the others
+        await asyncio.shield(self._pending_result)
+
+    def _flush(self) -> None:
+        """Send the latest coalesced command."""
+        command, result = self._pending_command, self._pending_result
+        self._flush_timer = None
+        self._pending_command = None
+        self._pending_result = None
+        if command is None or result is None:
+            return
+        self.hass.async_create_task(self._async_flush(command, result))
+
+    async def _async_flush(self, command: bytes, result: asyncio.Future[None]) -> None:
+        """Write a coalesced command and report the outcome to all waiters."""
+        try:
+            await self._async_write_command(command)
+        except Exception as e:  # pylint: disable=broad-except
+            result.set_exception(e)
+            # Mark it retrieved, every waiter may already have been cancelled
+            result.exception()
+        else:
+            result.set_result(None)
+        finally:
+            # Cancelled (e.g. on shutdown), don't leave the waiters hanging
+            if not result.done():
+                result.cancel()
+
+    def _drop_pending_command(self) -> None:
+        """Discard a coalesced command that has not been sent yet."""
+        if self._flush_timer is not None:
+            self._flush_timer.cancel()
+            self._flush_timer = None
+        # Release the waiters without an error, the newer discrete command
+        # supersedes the position they asked for (see send_command).
+        if self._pending_result is not None and not self._pending_result.done():
+            self._pending_result.set_result(None)
+        self._pending_command = None
+        self._pending_result = None
+
+    async def _async_write_command(self, command: bytes) -> None:
+        """
+        Write a command, connecting to the device first if needed.
+        The connection is kept open for DISCONNECT_DELAY seconds after the
+        last command so that quick successive commands skip the reconnect.
+        """
+        # Fast path: the lock only guards (re)connecting, an open connection
+        # can be written to directly.
+        client = self._client
+        if client and client.is_connected:
+            try:
+                await self._async_write_connected(client, command)
+                return
+            except (BleakError, asyncio.TimeoutError) as e:
+                LOGGER.warning("Failed to send command to connected device: %s", e)
+
         async with self._is_connecting:
+            # Drop the connection that just failed, unless another task has
+            # already replaced it while we waited for the lock.
+            if client is not None and self._client is client:
+                await self._async_disconnect()
+
             if self._client and self._client.is_connected:
                 LOGGER.debug("Client already connected, sending command directly.")
                 try:
-                    # Log the command before sending it
-                    LOGGER.debug("Sending command: %s", command.hex())
-                    # Changed response to False
-                    await self._client.write_gatt_char(GIRA_COMMAND_CHARACTERISTIC_UUID, command, response=False)
+                    await self._async_write_connected(self._client, command)
                     return
                 except (BleakError, asyncio.TimeoutError) as e:
                     LOGGER.warning("Failed to send command to connected device: %s", e)
                     # Fall through to attempt a reconnect
-                    await self._client.disconnect()
-                    self._client = None
+                    await self._async_disconnect()
             
             LOGGER.debug("Attempting to connect to %s (%s) to send command.", self.name, self.address)
             
-            device = bluetooth.async_ble_device_from_address(self.hass, self.address)
+            device = async_ble_device_from_address(self.hass, self.address)
             if not device:
                 LOGGER.error("Device %s (%s) not found in Home Assistant's Bluetooth devices.", self.name, self.address)
                 raise UpdateFailed(f"Device {self.name} not found.")
@@ -175,50 +328,98 @@ class GiraBLEClient:
                     BleakClient, 
                     device, 
                     self.name,
+                    disconnected_callback=self._on_disconnected,
+                    # Retries pick up the device from whichever adapter or
+                    # proxy currently sees it best.
+                    ble_device_callback=lambda: (
+                        async_ble_device_from_address(self.hass, self.address) or device
+                    ),
                     pair=True,
                     timeout=60,
                     max_attempts=5
                 )
                 self._client = client
+                # Arm the idle timer right away so the connection is closed
+                # even if the write below is cancelled or fails unexpectedly.
+                self._reset_disconnect_timer()
                 LOGGER.info("Successfully connected to %s (%s) and sending command.", self.name, self.address)
 
-                # Log the command before sending it
-                LOGGER.debug("Sending command: %s", command.hex())
-
-                # Send the command, reponse=True is crucial
-                await client.write_gatt_char(GIRA_COMMAND_CHARACTERISTIC_UUID, command, response=True)
-
+                await self._async_write_connected(client, command)
                 LOGGER.info("Command sent successfully to %s.", self.name)
             except (BleakError, asyncio.TimeoutError) as e:
                 LOGGER.error("Failed to connect or send command to %s (%s): %s", self.name, self.address, e)
-                raise UpdateFailed(f"Failed to connect and send command to {self.name}: {e}") from e
-            finally:
                 if client and client.is_connected:
-                    LOGGER.info("Disconnecting from %s (%s) after sending command.", self.name, self.address)
                     await client.disconnect()
                 self._client = None
+                raise UpdateFailed(f"Failed to connect and send command to {self.name}: {e}") from e
 
-    async def send_up_command(self) -> None:
-        """Send the command to raise the shutter."""
-        await self.send_command(_generate_command(PROPERTY_ID_MOVE, VALUE_UP))
-
-    async def send_down_command(self) -> None:
-        """Send the command to lower the shutter."""
-        await self.send_command(_generate_command(PROPERTY_ID_MOVE, VALUE_DOWN))
+    async def _async_write_connected(self, client: BleakClient, command: bytes) -> None:
+        """Write a command over an open connection and restart the idle timer."""
+        # Log the command before sending it
+        if LOGGER.isEnabledFor(logging.DEBUG):
+            LOGGER.debug("Sending command: %s", command.hex())
+        # Send the command, reponse=True is crucial
+        # Counted so the idle disconnect doesn't tear down a lock-free write
+        self._writes_in_flight += 1
+        try:
+            await client.write_gatt_char(GIRA_COMMAND_CHARACTERISTIC_UUID, command, response=True)
+        finally:
+            self._writes_in_flight -= 1
+        self._reset_disconnect_timer()
+
+    async def disconnect(self) -> None:
+        """Close the connection to the device, if any."""
+        self._drop_pending_command()
+        self._cancel_disconnect_timer()
+        async with self._is_connecting:
+            await self._async_disconnect()
+
+    def _on_disconnected(self, client: BleakClient) -> None:
+        """Forget the connection when the device drops it."""
+        if client is not self._client:
+            return
+        LOGGER.debug("%s (%s) disconnected.", self.name, self.address)
+        self._client = None
+        self._cancel_disconnect_timer()
+
+    def _reset_disconnect_timer(self) -> None:
+        """(Re)start the idle timer that closes the connection."""
+        self._cancel_disconnect_timer()
+        self._disconnect_timer = self.hass.loop.call_later(
+            DISCONNECT_DELAY, self._schedule_disconnect
+        )
 
-    async def send_stop_command(self) -> None:
-        """Send the command to stop the shutter."""
-        await self.send_command(_generate_command(PROPERTY_ID_STOP, VALUE_STOP))
+    def _cancel_disconnect_timer(self) -> None:
+        """Stop the idle timer, if running."""
+        if self._disconnect_timer is not None:
+            self._disconnect_timer.cancel()
+            self._disconnect_timer = None
 
-    async def send_step_up_command(self) -> None:
-        """Send the command to step the shutter up."""
-        await self.send_command(_generate_command(PROPERTY_ID_STEP, VALUE_UP))
+    def _schedule_disconnect(self) -> None:
+        """Disconnect once the connection has been idle for DISCONNECT_DELAY."""
+        self._disconnect_timer = None
+        self.hass.async_create_task(self._async_idle_disconnect())
 
-    async def send_step_down_command(self) -> None:
-        """Send the command to step the shutter down."""
-        await self.send_command(_generate_command(PROPERTY_ID_STEP, VALUE_DOWN))
+    async def _async_idle_disconnect(self) -> None:
+        """Disconnect unless a command is being written or re-armed the timer."""
+        async with self._is_connecting:
+            if self._disconnect_timer is not None or self._writes_in_flight:
+                return
+            await self._async_disconnect()
+
+    async def _async_disconnect(self) -> None:
+        """Disconnect the current client. Must be called with the lock held."""
+        client = self._client
+        self._client = None
+        if client and client.is_connected:
+            LOGGER.info("Disconnecting from %s (%s).", self.name, self.address)
+            await client.disconnect()
+
+    async def send(self, action: str) -> None:
+        """Send a fixed action: "up", "down", "stop", "step_up" or "step_down"."""
+        await self.send_command(_ACTIONS[action])
 
     async def set_absolute_position(self, percentage: int) -> None:
         """Set the absolute position of the blinds (0-100%)."""
         command = generate_position_command(percentage)
-        await self.send_command(command)
+        await self.send_command(command, coalesce=True)